@@ -149,446 +149,455 @@ def scrape_payment_address(checkout_url):
     
     return result
 
-def wait_for_payment_and_get_code(checkout_url, max_wait_minutes=10):
-    """Wait for payment confirmation, click reveal button, and extract gift card code."""
-    driver = None
-    result = {
-        "success": False,
-        "gift_card_code": None,
-        "error": None,
-        "message": None
-    }
+def _is_order_completed(driver):
+    """Check whether the checkout page currently loaded in driver shows a completed or paid order."""
+    page_text = driver.page_source.lower()
     
-    try:
-        headless = os.getenv("HEADLESS", "false").lower() == "true"
-        driver = setup_chrome_driver(headless=headless)
-        driver.implicitly_wait(10)
-        
-        print(f"Waiting for payment confirmation on: {checkout_url}", file=sys.stderr)
-        driver.get(checkout_url)
-        
-        max_wait_seconds = max_wait_minutes * 60
-        check_interval = 10  # Check every 10 seconds
-        elapsed = 0
-        payment_confirmed = False
+    # Check specifically for "order completed" or "order complete"
+    order_completed = (
+        "order completed" in page_text or 
+        "order complete" in page_text or
+        "ordercompleted" in page_text or
+        "completed" in page_text and "order" in page_text
+    )
+    
+    if order_completed:
+        print("Order completed detected! Looking for unseal button...", file=sys.stderr)
+        return True
+    # Also check for other success indicators as fallback
+    if any(indicator in page_text for indicator in [
+        "payment confirmed",
+        "payment received",
+        "gift card ready",
+        "code available",
+        "paid"
+    ]):
+        print("Payment confirmed! Looking for unseal/reveal button...", file=sys.stderr)
+        return True
+    return False
+
+def _unseal_and_extract_code(driver, result):
+    """Click the unseal element on a completed order page and extract the gift card code into result."""
+    # Order completed - now look for and click unseal button
+    print("Order completed! Looking for unseal button...", file=sys.stderr)
+    time.sleep(3)  # Give page a moment to fully load
+    
+    unseal_element = None
+    max_attempts = 3
+    
+    for attempt in range(max_attempts):
+        print(f"Attempt {attempt + 1}/{max_attempts} to find unseal element...", file=sys.stderr)
         
-        while elapsed < max_wait_seconds:
-            time.sleep(check_interval)
-            elapsed += check_interval
-            
-            # Refresh page to check for updates
+        # Refresh page to ensure we have latest content
+        if attempt > 0:
             driver.refresh()
-            time.sleep(2)
-            
-            # Check for order completed status
-            page_text = driver.page_source.lower()
-            page_title = driver.title.lower()
-            
-            # Check specifically for "order completed" or "order complete"
-            order_completed = (
-                "order completed" in page_text or 
-                "order complete" in page_text or
-                "ordercompleted" in page_text or
-                "completed" in page_text and "order" in page_text
-            )
-            
-            if order_completed:
-                payment_confirmed = True
-                print("Order completed detected! Looking for unseal button...", file=sys.stderr)
-                break
-            # Also check for other success indicators as fallback
-            elif any(indicator in page_text for indicator in [
-                "payment confirmed",
-                "payment received",
-                "gift card ready",
-                "code available",
-                "paid"
-            ]):
-                payment_confirmed = True
-                print("Payment confirmed! Looking for unseal/reveal button...", file=sys.stderr)
-                break
-            else:
-                print(f"Waiting for order completion... ({elapsed}s/{max_wait_seconds}s)", file=sys.stderr)
+            time.sleep(3)
         
-        if not payment_confirmed:
-            result["error"] = "Order not completed within timeout period"
-            result["message"] = f"Waited {max_wait_minutes} minutes but order was not completed"
-            return result
-        
-        # Order completed - now look for and click unseal button
-        print("Order completed! Looking for unseal button...", file=sys.stderr)
-        time.sleep(3)  # Give page a moment to fully load
-        
-        unseal_element = None
-        max_attempts = 3
+        # Try different selectors for unseal element (prioritize span with "Click to unseal")
+        unseal_selectors = [
+            # Look for span with "Click to unseal" text (exact match first)
+            (By.XPATH, "//span[normalize-space(text())='Click to unseal']"),
+            (By.XPATH, "//span[contains(text(), 'Click to unseal')]"),
+            (By.XPATH, "//span[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'click to unseal')]"),
+            (By.XPATH, "//span[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'unseal')]"),
+            # Look for elements with "peel" class (Bitrefill uses _peel-text_ class)
+            (By.CSS_SELECTOR, "span._peel-text_1ynwf_169"),
+            (By.CSS_SELECTOR, "span[class*='peel-text']"),
+            (By.CSS_SELECTOR, "span[class*='peel']"),
+            (By.CSS_SELECTOR, "[class*='peel-text']"),
+            # Case-insensitive text matching for buttons/links
+            (By.XPATH, "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'unseal')]"),
+            (By.XPATH, "//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'unseal')]"),
+            (By.XPATH, "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'unseal')]"),
+        ]
         
-        for attempt in range(max_attempts):
-            print(f"Attempt {attempt + 1}/{max_attempts} to find unseal element...", file=sys.stderr)
-            
-            # Refresh page to ensure we have latest content
-            if attempt > 0:
-                driver.refresh()
-                time.sleep(3)
-            
-            # Try different selectors for unseal element (prioritize span with "Click to unseal")
-            unseal_selectors = [
-                # Look for span with "Click to unseal" text (exact match first)
-                (By.XPATH, "//span[normalize-space(text())='Click to unseal']"),
-                (By.XPATH, "//span[contains(text(), 'Click to unseal')]"),
-                (By.XPATH, "//span[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'click to unseal')]"),
-                (By.XPATH, "//span[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'unseal')]"),
-                # Look for elements with "peel" class (Bitrefill uses _peel-text_ class)
-                (By.CSS_SELECTOR, "span._peel-text_1ynwf_169"),
-                (By.CSS_SELECTOR, "span[class*='peel-text']"),
-                (By.CSS_SELECTOR, "span[class*='peel']"),
-                (By.CSS_SELECTOR, "[class*='peel-text']"),
-                # Case-insensitive text matching for buttons/links
-                (By.XPATH, "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'unseal')]"),
-                (By.XPATH, "//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'unseal')]"),
-                (By.XPATH, "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'unseal')]"),
-            ]
-            
-            for by, selector in unseal_selectors:
+        for by, selector in unseal_selectors:
+            try:
+                # Wait for element to be present
                 try:
-                    # Wait for element to be present
+                    elements = WebDriverWait(driver, 5).until(
+                        EC.presence_of_all_elements_located((by, selector))
+                    )
+                except TimeoutException:
+                    elements = driver.find_elements(by, selector)
+                
+                for elem in elements:
                     try:
-                        elements = WebDriverWait(driver, 5).until(
-                            EC.presence_of_all_elements_located((by, selector))
-                        )
-                    except TimeoutException:
-                        elements = driver.find_elements(by, selector)
-                    
-                    for elem in elements:
-                        try:
-                            # Wait for element to be visible and check if it's displayed
-                            WebDriverWait(driver, 3).until(EC.visibility_of(elem))
+                        # Wait for element to be visible and check if it's displayed
+                        WebDriverWait(driver, 3).until(EC.visibility_of(elem))
+                        
+                        if elem.is_displayed():
+                            text = (elem.text or "").strip()
+                            elem_id = elem.get_attribute("id") or ""
+                            elem_class = elem.get_attribute("class") or ""
+                            tag_name = elem.tag_name.lower()
                             
-                            if elem.is_displayed():
-                                text = (elem.text or "").strip()
-                                elem_id = elem.get_attribute("id") or ""
-                                elem_class = elem.get_attribute("class") or ""
-                                tag_name = elem.tag_name.lower()
-                                
-                                print(f"Found element: tag={tag_name}, text='{text}', class='{elem_class[:50]}'", file=sys.stderr)
+                            print(f"Found element: tag={tag_name}, text='{text}', class='{elem_class[:50]}'", file=sys.stderr)
+                            
+                            # If it's a span with "unseal" text, find its clickable parent
+                            if tag_name == "span" and ("unseal" in text.lower() or "peel" in elem_class.lower()):
+                                print(f"Found unseal span! Text: '{text}', Class: '{elem_class}'. Looking for clickable parent...", file=sys.stderr)
                                 
-                                # If it's a span with "unseal" text, find its clickable parent
-                                if tag_name == "span" and ("unseal" in text.lower() or "peel" in elem_class.lower()):
-                                    print(f"Found unseal span! Text: '{text}', Class: '{elem_class}'. Looking for clickable parent...", file=sys.stderr)
-                                    
-                                    # Use JavaScript to find the clickable parent
-                                    try:
-                                        clickable_parent = driver.execute_script("""
-                                            var span = arguments[0];
-                                            var current = span.parentElement;
-                                            var maxDepth = 10;
-                                            var depth = 0;
+                                # Use JavaScript to find the clickable parent
+                                try:
+                                    clickable_parent = driver.execute_script("""
+                                        var span = arguments[0];
+                                        var current = span.parentElement;
+                                        var maxDepth = 10;
+                                        var depth = 0;
+                                        
+                                        while (current && depth < maxDepth) {
+                                            var style = window.getComputedStyle(current);
+                                            var isVisible = style.display !== 'none' && 
+                                                           style.visibility !== 'hidden' && 
+                                                           style.opacity !== '0';
                                             
-                                            while (current && depth < maxDepth) {
-                                                var style = window.getComputedStyle(current);
-                                                var isVisible = style.display !== 'none' && 
-                                                               style.visibility !== 'hidden' && 
-                                                               style.opacity !== '0';
+                                            if (isVisible) {
+                                                // Check if it's clickable
+                                                var hasClickHandler = current.onclick || 
+                                                                     current.getAttribute('onclick') ||
+                                                                     current.getAttribute('role') === 'button' ||
+                                                                     current.style.cursor === 'pointer' ||
+                                                                     current.classList.toString().toLowerCase().includes('click') ||
+                                                                     current.classList.toString().toLowerCase().includes('button') ||
+                                                                     current.classList.toString().toLowerCase().includes('cursor');
                                                 
-                                                if (isVisible) {
-                                                    // Check if it's clickable
-                                                    var hasClickHandler = current.onclick || 
-                                                                         current.getAttribute('onclick') ||
-                                                                         current.getAttribute('role') === 'button' ||
-                                                                         current.style.cursor === 'pointer' ||
-                                                                         current.classList.toString().toLowerCase().includes('click') ||
-                                                                         current.classList.toString().toLowerCase().includes('button') ||
-                                                                         current.classList.toString().toLowerCase().includes('cursor');
-                                                    
-                                                    if (hasClickHandler) {
-                                                        return current;
-                                                    }
-                                                    
-                                                    // Also check if it's a div/button/a that might be clickable
-                                                    var tag = current.tagName.toLowerCase();
-                                                    if (tag === 'button' || tag === 'a' || 
-                                                        (tag === 'div' && (current.onclick || current.getAttribute('onclick')))) {
-                                                        return current;
-                                                    }
+                                                if (hasClickHandler) {
+                                                    return current;
                                                 }
                                                 
-                                                current = current.parentElement;
-                                                depth++;
+                                                // Also check if it's a div/button/a that might be clickable
+                                                var tag = current.tagName.toLowerCase();
+                                                if (tag === 'button' || tag === 'a' || 
+                                                    (tag === 'div' && (current.onclick || current.getAttribute('onclick')))) {
+                                                    return current;
+                                                }
                                             }
                                             
-                                            // If no clickable parent, return the span itself
-                                            return span;
-                                        """, elem)
+                                            current = current.parentElement;
+                                            depth++;
+                                        }
                                         
-                                        if clickable_parent:
-                                            unseal_element = clickable_parent
-                                            print(f"Found clickable parent! Tag: {clickable_parent.tag_name}, Will click this element.", file=sys.stderr)
-                                            break
-                                    except Exception as e:
-                                        print(f"Error finding parent: {e}. Will try clicking span directly.", file=sys.stderr)
-                                        unseal_element = elem
-                                        break
+                                        // If no clickable parent, return the span itself
+                                        return span;
+                                    """, elem)
                                     
-                                    # If JavaScript didn't work, try XPath
-                                    if not unseal_element:
-                                        try:
-                                            parent = elem.find_element(By.XPATH, "./ancestor::*[@onclick or @role='button' or contains(@class, 'click') or contains(@class, 'button') or contains(@class, 'cursor')][1]")
-                                            if parent and parent.is_displayed():
-                                                unseal_element = parent
-                                                print(f"Found parent via XPath! Tag: {parent.tag_name}", file=sys.stderr)
-                                                break
-                                        except:
-                                            # Fallback: click span directly
-                                            unseal_element = elem
-                                            print(f"Will click span directly.", file=sys.stderr)
-                                            break
-                                # For buttons/links with unseal text
-                                elif "unseal" in text.lower() or "unseal" in elem_id.lower() or "unseal" in elem_class.lower():
+                                    if clickable_parent:
+                                        unseal_element = clickable_parent
+                                        print(f"Found clickable parent! Tag: {clickable_parent.tag_name}, Will click this element.", file=sys.stderr)
+                                        break
+                                except Exception as e:
+                                    print(f"Error finding parent: {e}. Will try clicking span directly.", file=sys.stderr)
                                     unseal_element = elem
-                                    print(f"Found unseal element! Tag: {tag_name}, Text: '{text}'", file=sys.stderr)
                                     break
-                        except Exception as e:
-                            continue
-                    
-                    if unseal_element:
-                        break
-                except Exception as e:
-                    print(f"Error with selector {selector}: {e}", file=sys.stderr)
-                    continue
-            
-            # If still not found, try finding all spans with "unseal" and their parents
-            if not unseal_element:
-                try:
-                    # Look for all spans with "unseal" text
-                    all_spans = driver.find_elements(By.TAG_NAME, "span")
-                    for span in all_spans:
-                        try:
-                            if span.is_displayed():
-                                text = (span.text or "").strip().lower()
-                                span_class = (span.get_attribute("class") or "").lower()
                                 
-                                if "unseal" in text or "peel" in span_class:
-                                    # Use JavaScript to find clickable parent
+                                # If JavaScript didn't work, try XPath
+                                if not unseal_element:
                                     try:
-                                        clickable_parent = driver.execute_script("""
-                                            var span = arguments[0];
-                                            var current = span.parentElement;
-                                            var maxDepth = 10;
-                                            var depth = 0;
-                                            
-                                            while (current && depth < maxDepth) {
-                                                var style = window.getComputedStyle(current);
-                                                var isVisible = style.display !== 'none' && style.visibility !== 'hidden';
-                                                
-                                                if (isVisible && (current.onclick || current.getAttribute('onclick') || 
-                                                    current.getAttribute('role') === 'button' ||
-                                                    current.classList.toString().toLowerCase().includes('click') ||
-                                                    current.classList.toString().toLowerCase().includes('button'))) {
-                                                    return current;
-                                                }
-                                                current = current.parentElement;
-                                                depth++;
-                                            }
-                                            return span;
-                                        """, span)
-                                        
-                                        if clickable_parent:
-                                            unseal_element = clickable_parent
-                                            print(f"Found unseal span via broad search! Using parent. Span text: '{span.text}'", file=sys.stderr)
+                                        parent = elem.find_element(By.XPATH, "./ancestor::*[@onclick or @role='button' or contains(@class, 'click') or contains(@class, 'button') or contains(@class, 'cursor')][1]")
+                                        if parent and parent.is_displayed():
+                                            unseal_element = parent
+                                            print(f"Found parent via XPath! Tag: {parent.tag_name}", file=sys.stderr)
                                             break
                                     except:
-                                        unseal_element = span
-                                        print(f"Found unseal span via broad search! Clicking span directly. Text: '{span.text}'", file=sys.stderr)
+                                        # Fallback: click span directly
+                                        unseal_element = elem
+                                        print(f"Will click span directly.", file=sys.stderr)
                                         break
-                        except Exception:
-                            continue
-                    
-                    # Also check buttons/links/clickables
-                    if not unseal_element:
-                        all_buttons = driver.find_elements(By.TAG_NAME, "button")
-                        all_links = driver.find_elements(By.TAG_NAME, "a")
-                        all_clickables = driver.find_elements(By.CSS_SELECTOR, "[onclick], [role='button'], [class*='cursor-pointer'], [class*='clickable']")
-                        
-                        for elem in all_buttons + all_links + all_clickables:
-                            try:
-                                if elem.is_displayed():
-                                    text = (elem.text or "").strip().lower()
-                                    elem_id = (elem.get_attribute("id") or "").lower()
-                                    elem_class = (elem.get_attribute("class") or "").lower()
-                                    onclick = (elem.get_attribute("onclick") or "").lower()
+                            # For buttons/links with unseal text
+                            elif "unseal" in text.lower() or "unseal" in elem_id.lower() or "unseal" in elem_class.lower():
+                                unseal_element = elem
+                                print(f"Found unseal element! Tag: {tag_name}, Text: '{text}'", file=sys.stderr)
+                                break
+                    except Exception as e:
+                        continue
+                
+                if unseal_element:
+                    break
+            except Exception as e:
+                print(f"Error with selector {selector}: {e}", file=sys.stderr)
+                continue
+        
+        # If still not found, try finding all spans with "unseal" and their parents
+        if not unseal_element:
+            try:
+                # Look for all spans with "unseal" text
+                all_spans = driver.find_elements(By.TAG_NAME, "span")
+                for span in all_spans:
+                    try:
+                        if span.is_displayed():
+                            text = (span.text or "").strip().lower()
+                            span_class = (span.get_attribute("class") or "").lower()
+                            
+                            if "unseal" in text or "peel" in span_class:
+                                # Use JavaScript to find clickable parent
+                                try:
+                                    clickable_parent = driver.execute_script("""
+                                        var span = arguments[0];
+                                        var current = span.parentElement;
+                                        var maxDepth = 10;
+                                        var depth = 0;
+                                        
+                                        while (current && depth < maxDepth) {
+                                            var style = window.getComputedStyle(current);
+                                            var isVisible = style.display !== 'none' && style.visibility !== 'hidden';
+                                            
+                                            if (isVisible && (current.onclick || current.getAttribute('onclick') || 
+                                                current.getAttribute('role') === 'button' ||
+                                                current.classList.toString().toLowerCase().includes('click') ||
+                                                current.classList.toString().toLowerCase().includes('button'))) {
+                                                return current;
+                                            }
+                                            current = current.parentElement;
+                                            depth++;
+                                        }
+                                        return span;
+                                    """, span)
                                     
-                                    if any("unseal" in s for s in [text, elem_id, elem_class, onclick]):
-                                        unseal_element = elem
-                                        print(f"Found unseal element via broad search! Text: '{elem.text}', Tag: {elem.tag_name}", file=sys.stderr)
+                                    if clickable_parent:
+                                        unseal_element = clickable_parent
+                                        print(f"Found unseal span via broad search! Using parent. Span text: '{span.text}'", file=sys.stderr)
                                         break
-                                    elif not unseal_element and any(word in text for word in ["reveal", "show", "view", "unhide"]):
-                                        unseal_element = elem
-                                        print(f"Found reveal/show element via broad search. Text: '{elem.text}'", file=sys.stderr)
-                            except Exception:
-                                continue
-                except Exception as e:
-                    print(f"Error in broad search: {e}", file=sys.stderr)
-            
-            if unseal_element:
-                break
-            
-            # If not found, wait a bit and try again
-            if attempt < max_attempts - 1:
-                print("Unseal element not found yet. Waiting 2 seconds and retrying...", file=sys.stderr)
-                time.sleep(2)
+                                except:
+                                    unseal_element = span
+                                    print(f"Found unseal span via broad search! Clicking span directly. Text: '{span.text}'", file=sys.stderr)
+                                    break
+                    except Exception:
+                        continue
+                
+                # Also check buttons/links/clickables
+                if not unseal_element:
+                    all_buttons = driver.find_elements(By.TAG_NAME, "button")
+                    all_links = driver.find_elements(By.TAG_NAME, "a")
+                    all_clickables = driver.find_elements(By.CSS_SELECTOR, "[onclick], [role='button'], [class*='cursor-pointer'], [class*='clickable']")
+                    
+                    for elem in all_buttons + all_links + all_clickables:
+                        try:
+                            if elem.is_displayed():
+                                text = (elem.text or "").strip().lower()
+                                elem_id = (elem.get_attribute("id") or "").lower()
+                                elem_class = (elem.get_attribute("class") or "").lower()
+                                onclick = (elem.get_attribute("onclick") or "").lower()
+                                
+                                if any("unseal" in s for s in [text, elem_id, elem_class, onclick]):
+                                    unseal_element = elem
+                                    print(f"Found unseal element via broad search! Text: '{elem.text}', Tag: {elem.tag_name}", file=sys.stderr)
+                                    break
+                                elif not unseal_element and any(word in text for word in ["reveal", "show", "view", "unhide"]):
+                                    unseal_element = elem
+                                    print(f"Found reveal/show element via broad search. Text: '{elem.text}'", file=sys.stderr)
+                        except Exception:
+                            continue
+            except Exception as e:
+                print(f"Error in broad search: {e}", file=sys.stderr)
         
         if unseal_element:
-            print(f"Found unseal element! Attempting to click... (Tag: {unseal_element.tag_name}, Text: '{unseal_element.text}')", file=sys.stderr)
+            break
+        
+        # If not found, wait a bit and try again
+        if attempt < max_attempts - 1:
+            print("Unseal element not found yet. Waiting 2 seconds and retrying...", file=sys.stderr)
+            time.sleep(2)
+    
+    if unseal_element:
+        print(f"Found unseal element! Attempting to click... (Tag: {unseal_element.tag_name}, Text: '{unseal_element.text}')", file=sys.stderr)
+        try:
+            # Scroll element into view
+            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", unseal_element)
+            time.sleep(1)
+            
+            # Wait for element to be clickable
             try:
-                # Scroll element into view
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", unseal_element)
-                time.sleep(1)
-                
-                # Wait for element to be clickable
-                try:
-                    WebDriverWait(driver, 5).until(EC.element_to_be_clickable(unseal_element))
-                except:
-                    pass  # Continue anyway
-                
-                # Try multiple click methods
-                clicked = False
+                WebDriverWait(driver, 5).until(EC.element_to_be_clickable(unseal_element))
+            except:
+                pass  # Continue anyway
+            
+            # Try multiple click methods
+            clicked = False
+            
+            # Method 1: JavaScript click (most reliable for spans)
+            try:
+                driver.execute_script("arguments[0].click();", unseal_element)
+                clicked = True
+                print("✓ Clicked using JavaScript click()", file=sys.stderr)
+            except Exception as e1:
+                print(f"JavaScript click failed: {e1}. Trying regular click...", file=sys.stderr)
                 
-                # Method 1: JavaScript click (most reliable for spans)
+                # Method 2: Regular click
                 try:
-                    driver.execute_script("arguments[0].click();", unseal_element)
+                    unseal_element.click()
                     clicked = True
-                    print("✓ Clicked using JavaScript click()", file=sys.stderr)
-                except Exception as e1:
-                    print(f"JavaScript click failed: {e1}. Trying regular click...", file=sys.stderr)
+                    print("✓ Clicked using regular click()", file=sys.stderr)
+                except Exception as e2:
+                    print(f"Regular click failed: {e2}. Trying action chain...", file=sys.stderr)
                     
-                    # Method 2: Regular click
+                    # Method 3: Action chain
                     try:
-                        unseal_element.click()
+                        from selenium.webdriver.common.action_chains import ActionChains
+                        actions = ActionChains(driver)
+                        actions.move_to_element(unseal_element).click().perform()
                         clicked = True
-                        print("✓ Clicked using regular click()", file=sys.stderr)
-                    except Exception as e2:
-                        print(f"Regular click failed: {e2}. Trying action chain...", file=sys.stderr)
+                        print("✓ Clicked using ActionChains", file=sys.stderr)
+                    except Exception as e3:
+                        print(f"ActionChains click failed: {e3}. Trying mouse events...", file=sys.stderr)
                         
-                        # Method 3: Action chain
+                        # Method 4: Simulate mouse events
                         try:
-                            from selenium.webdriver.common.action_chains import ActionChains
-                            actions = ActionChains(driver)
-                            actions.move_to_element(unseal_element).click().perform()
+                            driver.execute_script("""
+                                var elem = arguments[0];
+                                var event = new MouseEvent('click', {
+                                    view: window,
+                                    bubbles: true,
+                                    cancelable: true
+                                });
+                                elem.dispatchEvent(event);
+                            """, unseal_element)
                             clicked = True
-                            print("✓ Clicked using ActionChains", file=sys.stderr)
-                        except Exception as e3:
-                            print(f"ActionChains click failed: {e3}. Trying mouse events...", file=sys.stderr)
-                            
-                            # Method 4: Simulate mouse events
-                            try:
-                                driver.execute_script("""
-                                    var elem = arguments[0];
-                                    var event = new MouseEvent('click', {
-                                        view: window,
-                                        bubbles: true,
-                                        cancelable: true
-                                    });
-                                    elem.dispatchEvent(event);
-                                """, unseal_element)
-                                clicked = True
-                                print("✓ Clicked using mouse event simulation", file=sys.stderr)
-                            except Exception as e4:
-                                print(f"Mouse event click failed: {e4}", file=sys.stderr)
+                            print("✓ Clicked using mouse event simulation", file=sys.stderr)
+                        except Exception as e4:
+                            print(f"Mouse event click failed: {e4}", file=sys.stderr)
+            
+            if clicked:
+                print("Unseal element clicked successfully! Waiting for code to appear...", file=sys.stderr)
+                time.sleep(5)  # Wait for code to appear
                 
-                if clicked:
-                    print("Unseal element clicked successfully! Waiting for code to appear...", file=sys.stderr)
-                    time.sleep(5)  # Wait for code to appear
-                    
-                    # Refresh page to ensure code is visible
-                    driver.refresh()
-                    time.sleep(3)
-                else:
-                    print("⚠ Failed to click unseal element with all methods", file=sys.stderr)
-            except Exception as e:
-                print(f"Error clicking unseal element: {e}", file=sys.stderr)
-        else:
-            print("WARNING: No unseal element found after all attempts. Code might already be visible or page structure changed.", file=sys.stderr)
-            print("Searching page source for 'unseal' or 'peel'...", file=sys.stderr)
-            page_source_lower = driver.page_source.lower()
-            if "unseal" in page_source_lower or "peel" in page_source_lower:
-                print("Found 'unseal' or 'peel' in page source but couldn't locate element. Page source snippet:", file=sys.stderr)
-                # Find the relevant section
-                import re
-                matches = re.findall(r'.{0,200}(?:unseal|peel).{0,200}', page_source_lower, re.IGNORECASE)
-                for match in matches[:3]:
-                    print(f"  ...{match}...", file=sys.stderr)
+                # Refresh page to ensure code is visible
+                driver.refresh()
+                time.sleep(3)
+            else:
+                print("⚠ Failed to click unseal element with all methods", file=sys.stderr)
+        except Exception as e:
+            print(f"Error clicking unseal element: {e}", file=sys.stderr)
+    else:
+        print("WARNING: No unseal element found after all attempts. Code might already be visible or page structure changed.", file=sys.stderr)
+        print("Searching page source for 'unseal' or 'peel'...", file=sys.stderr)
+        page_source_lower = driver.page_source.lower()
+        if "unseal" in page_source_lower or "peel" in page_source_lower:
+            print("Found 'unseal' or 'peel' in page source but couldn't locate element. Page source snippet:", file=sys.stderr)
+            # Find the relevant section
+            import re
+            matches = re.findall(r'.{0,200}(?:unseal|peel).{0,200}', page_source_lower, re.IGNORECASE)
+            for match in matches[:3]:
+                print(f"  ...{match}...", file=sys.stderr)
+    
+    # Now extract the gift card code
+    gift_card_code = None
+    
+    # Try different selectors for gift card code
+    code_selectors = [
+        (By.CSS_SELECTOR, "[data-testid*='gift-card-code']"),
+        (By.CSS_SELECTOR, "[data-testid*='code']"),
+        (By.CSS_SELECTOR, ".gift-card-code"),
+        (By.CSS_SELECTOR, ".code"),
+        (By.CSS_SELECTOR, "code"),
+        (By.CSS_SELECTOR, ".voucher-code"),
+        (By.CSS_SELECTOR, ".redemption-code"),
+        (By.XPATH, "//*[contains(@class, 'code') or contains(@class, 'gift-card')]"),
+        (By.XPATH, "//*[contains(@class, 'voucher')]"),
+    ]
+    
+    for by, selector in code_selectors:
+        try:
+            elements = driver.find_elements(by, selector)
+            for elem in elements:
+                text = elem.text.strip()
+                # Gift card codes are typically alphanumeric, 10-20 chars
+                if text and len(text) >= 10 and len(text) <= 20:
+                    # Check if it looks like a gift card code (alphanumeric, possibly with dashes)
+                    if all(c.isalnum() or c in ['-', ' '] for c in text):
+                        gift_card_code = text.replace(' ', '').replace('-', '')
+                        break
+                # Also check for longer codes that might be split across lines
+                elif text and len(text) > 20:
+                    # Try to extract code from longer text
+                    import re
+                    code_match = re.search(r'([A-Z0-9]{10,20})', text)
+                    if code_match:
+                        gift_card_code = code_match.group(1)
+                        break
+            if gift_card_code:
+                break
+        except Exception:
+            continue
+    
+    # Also check page source for code patterns
+    if not gift_card_code:
+        page_source = driver.page_source
+        import re
+        # Look for patterns like "code: ABC123..." or "gift card: XYZ..."
+        patterns = [
+            r'code[:\s]+([A-Z0-9]{10,20})',
+            r'gift[-\s]?card[:\s]+([A-Z0-9]{10,20})',
+            r'redemption[-\s]?code[:\s]+([A-Z0-9]{10,20})',
+            r'voucher[-\s]?code[:\s]+([A-Z0-9]{10,20})',
+            r'([A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4})',  # Format: XXXX-XXXX-XXXX-XXXX
+            r'([A-Z0-9]{10,20})',  # Any alphanumeric string 10-20 chars
+        ]
+        for pattern in patterns:
+            matches = re.findall(pattern, page_source, re.IGNORECASE)
+            if matches:
+                # Take the longest match that looks like a code
+                potential_code = max(matches, key=len)
+                if len(potential_code) >= 10:
+                    gift_card_code = potential_code.upper().replace('-', '')
+                    break
+    
+    if gift_card_code:
+        result["success"] = True
+        result["gift_card_code"] = gift_card_code
+        result["message"] = "Payment confirmed and gift card code extracted"
+        print(f"Found gift card code: {gift_card_code}", file=sys.stderr)
+    else:
+        result["error"] = "Could not extract gift card code"
+        result["message"] = "Payment confirmed but gift card code not found. Page may have changed structure."
+        print("Payment confirmed but code not found. Page source snippet:", file=sys.stderr)
+        print(driver.page_source[:2000], file=sys.stderr)
+    
+    return result
+
+def wait_for_payment_and_get_code(checkout_url, max_wait_minutes=10):
+    """Wait for payment confirmation, click reveal button, and extract gift card code."""
+    driver = None
+    result = {
+        "success": False,
+        "gift_card_code": None,
+        "error": None,
+        "message": None
+    }
+    
+    try:
+        headless = os.getenv("HEADLESS", "false").lower() == "true"
+        driver = setup_chrome_driver(headless=headless)
+        driver.implicitly_wait(10)
         
-        # Now extract the gift card code
-        gift_card_code = None
+        print(f"Waiting for payment confirmation on: {checkout_url}", file=sys.stderr)
+        driver.get(checkout_url)
         
-        # Try different selectors for gift card code
-        code_selectors = [
-            (By.CSS_SELECTOR, "[data-testid*='gift-card-code']"),
-            (By.CSS_SELECTOR, "[data-testid*='code']"),
-            (By.CSS_SELECTOR, ".gift-card-code"),
-            (By.CSS_SELECTOR, ".code"),
-            (By.CSS_SELECTOR, "code"),
-            (By.CSS_SELECTOR, ".voucher-code"),
-            (By.CSS_SELECTOR, ".redemption-code"),
-            (By.XPATH, "//*[contains(@class, 'code') or contains(@class, 'gift-card')]"),
-            (By.XPATH, "//*[contains(@class, 'voucher')]"),
-        ]
+        max_wait_seconds = max_wait_minutes * 60
+        check_interval = 10  # Check every 10 seconds
+        elapsed = 0
+        payment_confirmed = False
         
-        for by, selector in code_selectors:
-            try:
-                elements = driver.find_elements(by, selector)
-                for elem in elements:
-                    text = elem.text.strip()
-                    # Gift card codes are typically alphanumeric, 10-20 chars
-                    if text and len(text) >= 10 and len(text) <= 20:
-                        # Check if it looks like a gift card code (alphanumeric, possibly with dashes)
-                        if all(c.isalnum() or c in ['-', ' '] for c in text):
-                            gift_card_code = text.replace(' ', '').replace('-', '')
-                            break
-                    # Also check for longer codes that might be split across lines
-                    elif text and len(text) > 20:
-                        # Try to extract code from longer text
-                        import re
-                        code_match = re.search(r'([A-Z0-9]{10,20})', text)
-                        if code_match:
-                            gift_card_code = code_match.group(1)
-                            break
-                if gift_card_code:
-                    break
-            except Exception:
-                continue
+        while elapsed < max_wait_seconds:
+            time.sleep(check_interval)
+            elapsed += check_interval
+            
+            # Refresh page to check for updates
+            driver.refresh()
+            time.sleep(2)
+            
+            if _is_order_completed(driver):
+                payment_confirmed = True
+                break
+            else:
+                print(f"Waiting for order completion... ({elapsed}s/{max_wait_seconds}s)", file=sys.stderr)
         
-        # Also check page source for code patterns
-        if not gift_card_code:
-            page_source = driver.page_source
-            import re
-            # Look for patterns like "code: ABC123..." or "gift card: XYZ..."
-            patterns = [
-                r'code[:\s]+([A-Z0-9]{10,20})',
-                r'gift[-\s]?card[:\s]+([A-Z0-9]{10,20})',
-                r'redemption[-\s]?code[:\s]+([A-Z0-9]{10,20})',
-                r'voucher[-\s]?code[:\s]+([A-Z0-9]{10,20})',
-                r'([A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4})',  # Format: XXXX-XXXX-XXXX-XXXX
-                r'([A-Z0-9]{10,20})',  # Any alphanumeric string 10-20 chars
-            ]
-            for pattern in patterns:
-                matches = re.findall(pattern, page_source, re.IGNORECASE)
-                if matches:
-                    # Take the longest match that looks like a code
-                    potential_code = max(matches, key=len)
-                    if len(potential_code) >= 10:
-                        gift_card_code = potential_code.upper().replace('-', '')
-                        break
+        if not payment_confirmed:
+            result["error"] = "Order not completed within timeout period"
+            result["message"] = f"Waited {max_wait_minutes} minutes but order was not completed"
+            return result
         
-        if gift_card_code:
-            result["success"] = True
-            result["gift_card_code"] = gift_card_code
-            result["message"] = "Payment confirmed and gift card code extracted"
-            print(f"Found gift card code: {gift_card_code}", file=sys.stderr)
-        else:
-            result["error"] = "Could not extract gift card code"
-            result["message"] = "Payment confirmed but gift card code not found. Page may have changed structure."
-            print("Payment confirmed but code not found. Page source snippet:", file=sys.stderr)
-            print(driver.page_source[:2000], file=sys.stderr)
+        _unseal_and_extract_code(driver, result)
         
     except Exception as e:
         result["error"] = str(e)
@@ -600,13 +609,194 @@ def wait_for_payment_and_get_code(checkout_url, max_wait_minutes=10):
     
     return result
 
+def wait_for_payments_and_get_codes(checkout_urls, max_wait_minutes=10, max_tabs_per_browser=25):
+    """Wait for many orders at once, sharing each Chrome instance across up to max_tabs_per_browser checkout tabs.
+
+    Status checks are round-robined across all pending tabs. When an order completes, its tab is
+    queued for the same unseal/extraction logic used by wait_for_payment_and_get_code(). Extraction
+    still blocks the scheduler while it runs, so at most max_extractions_per_round orders are
+    extracted between polling rounds, with no implicit wait, to keep the other tabs polled. A
+    failure in one tab or browser is recorded for the affected orders only and does not affect the
+    others. A page load that times out is stopped and retried on the next round until the tab's own
+    deadline passes, since the order may already be paid.
+    """
+    results = [
+        {
+            "checkout_url": checkout_url,
+            "success": False,
+            "gift_card_code": None,
+            "error": None,
+            "message": None
+        }
+        for checkout_url in checkout_urls
+    ]
+
+    if max_tabs_per_browser < 1:
+        for result in results:
+            result["error"] = "Invalid max_tabs_per_browser"
+            result["message"] = f"max_tabs_per_browser must be at least 1, got {max_tabs_per_browser}"
+        return results
+
+    drivers = []
+    # Each entry is (result index, driver, window handle, deadline)
+    pending = []
+    # Completed orders waiting for unseal/extraction
+    ready = []
+    max_wait_seconds = max_wait_minutes * 60
+    check_interval = 10  # Check every 10 seconds
+    page_load_timeout = 30  # Stop a stalled load instead of blocking every other tab
+    max_extractions_per_round = 3
+
+    try:
+        headless = os.getenv("HEADLESS", "false").lower() == "true"
+
+        for start in range(0, len(checkout_urls), max_tabs_per_browser):
+            end = min(start + max_tabs_per_browser, len(checkout_urls))
+            try:
+                driver = setup_chrome_driver(headless=headless)
+                drivers.append(driver)
+                driver.implicitly_wait(10)
+                driver.set_page_load_timeout(page_load_timeout)
+            except Exception as e:
+                for index in range(start, end):
+                    results[index]["error"] = str(e)
+                    results[index]["message"] = f"Error starting browser: {str(e)}"
+                print(f"Error starting browser for orders {start + 1}-{end}: {e}", file=sys.stderr)
+                continue
+            print(f"Started browser {len(drivers)} for orders {start + 1}-{end}", file=sys.stderr)
+
+            for index in range(start, end):
+                checkout_url = checkout_urls[index]
+                entry = None
+                try:
+                    # Reuse the initial window for the first tab, open new tabs for the rest
+                    if index != start:
+                        driver.switch_to.new_window("tab")
+                    entry = (index, driver, driver.current_window_handle, time.time() + max_wait_seconds)
+                    pending.append(entry)
+                    print(f"Waiting for payment confirmation on: {checkout_url}", file=sys.stderr)
+                    driver.get(checkout_url)
+                except TimeoutException:
+                    # Keep the tab; the refresh pass retries the load
+                    _stop_loading(driver)
+                except Exception as e:
+                    if entry in pending:
+                        _finish_tab(entry, pending, results, e)
+                    else:
+                        results[index]["error"] = str(e)
+                        results[index]["message"] = f"Error opening checkout tab: {str(e)}"
+                        print(f"Error opening tab for {checkout_url}: {e}", file=sys.stderr)
+
+        start_time = time.time()
+
+        while pending or ready:
+            if pending:
+                time.sleep(check_interval)
+
+                # Refresh every pending tab in turn; each refresh blocks until its page loads or times out
+                for entry in list(pending):
+                    index, driver, handle, deadline = entry
+                    try:
+                        driver.switch_to.window(handle)
+                        # A tab whose first load timed out may never have left the blank page
+                        if driver.current_url in ("about:blank", "data:,"):
+                            driver.get(checkout_urls[index])
+                        else:
+                            driver.refresh()
+                    except TimeoutException:
+                        _stop_loading(driver)
+                    except Exception as e:
+                        _finish_tab(entry, pending, results, e)
+                time.sleep(2)
+
+                # Check each refreshed tab; a tab past its own deadline is only timed out after this final check
+                for entry in list(pending):
+                    index, driver, handle, deadline = entry
+                    try:
+                        driver.switch_to.window(handle)
+                        if not _is_order_completed(driver):
+                            if time.time() >= deadline:
+                                results[index]["error"] = "Order not completed within timeout period"
+                                results[index]["message"] = f"Waited {max_wait_minutes} minutes but order was not completed"
+                                _finish_tab(entry, pending, results)
+                            continue
+                        print(f"Order {index + 1}/{len(checkout_urls)} completed: {checkout_urls[index]}", file=sys.stderr)
+                        pending.remove(entry)
+                        ready.append(entry)
+                    except Exception as e:
+                        _finish_tab(entry, pending, results, e)
+
+            # Extract a few completed orders per round so the remaining tabs keep being polled
+            for entry in ready[:max_extractions_per_round]:
+                index, driver, handle, deadline = entry
+                try:
+                    driver.switch_to.window(handle)
+                    driver.implicitly_wait(0)
+                    try:
+                        _unseal_and_extract_code(driver, results[index])
+                    finally:
+                        driver.implicitly_wait(10)
+                    _finish_tab(entry, ready, results)
+                except TimeoutException as e:
+                    # The order is paid, so retry a stalled extraction until the tab's deadline
+                    _stop_loading(driver)
+                    if time.time() >= deadline:
+                        _finish_tab(entry, ready, results, e)
+                except Exception as e:
+                    _finish_tab(entry, ready, results, e)
+
+            elapsed = int(time.time() - start_time)
+            print(f"Waiting for order completion... {len(pending)} pending, {len(ready)} awaiting extraction ({elapsed}s)", file=sys.stderr)
+
+    except Exception as e:
+        for result in results:
+            if not result["success"] and result["error"] is None:
+                result["error"] = str(e)
+                result["message"] = f"Error waiting for payment: {str(e)}"
+        print(f"Error: {e}", file=sys.stderr)
+    finally:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    return results
+
+def _stop_loading(driver):
+    """Stop a page load that exceeded the page load timeout so the tab can be used again."""
+    try:
+        driver.execute_script("window.stop();")
+    except Exception:
+        pass
+
+def _finish_tab(entry, entries, results, error=None):
+    """Remove a tab from entries, recording error on its order and closing the tab if possible."""
+    index, driver, handle, deadline = entry
+    entries.remove(entry)
+
+    if error is not None:
+        results[index]["error"] = str(error)
+        results[index]["message"] = f"Error waiting for payment: {str(error)}"
+        print(f"Error on order {index + 1}: {error}", file=sys.stderr)
+
+    # Closing the last window ends the browser session, so leave it for quit()
+    try:
+        if len(driver.window_handles) > 1:
+            driver.switch_to.window(handle)
+            driver.close()
+            # WebDriver commands need an open current window, so move off the closed tab
+            driver.switch_to.window(driver.window_handles[0])
+    except Exception:
+        pass
+
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
         result = {
             "success": False,
             "error": "Missing action parameter",
-            "message": "Usage: python3 bitrefill_payment_flow.py <action> [checkout_url]"
+            "message": "Usage: python3 bitrefill_payment_flow.py <action> [checkout_url] (wait_for_codes takes <url> [<url> ...])"
         }
         print(json.dumps(result))
         sys.exit(1)
@@ -642,12 +832,49 @@ def main():
         result = wait_for_payment_and_get_code(checkout_url, max_wait)
         print(json.dumps(result))
         sys.exit(0 if result["success"] else 1)
-    
+
+    elif action == "wait_for_codes":
+        checkout_urls = sys.argv[2:]
+        if not checkout_urls:
+            result = {
+                "success": False,
+                "error": "Missing checkout URL",
+                "message": "Please provide one or more checkout URLs"
+            }
+            print(json.dumps(result))
+            sys.exit(1)
+
+        try:
+            max_wait = int(os.getenv("MAX_WAIT_MINUTES", "10"))
+            max_tabs = int(os.getenv("MAX_TABS_PER_BROWSER", "25"))
+        except ValueError as e:
+            result = {
+                "success": False,
+                "error": "Invalid MAX_WAIT_MINUTES or MAX_TABS_PER_BROWSER",
+                "message": f"MAX_WAIT_MINUTES and MAX_TABS_PER_BROWSER must be integers: {str(e)}"
+            }
+            print(json.dumps(result))
+            sys.exit(1)
+
+        results = wait_for_payments_and_get_codes(checkout_urls, max_wait, max_tabs)
+        failed = sum(1 for r in results if not r["success"])
+        result = {
+            "success": failed == 0,
+            "results": results,
+            "error": None,
+            "message": f"Extracted gift card codes for all {len(results)} orders"
+        }
+        if failed:
+            result["error"] = f"{failed} of {len(results)} orders failed"
+            result["message"] = f"Extracted gift card codes for {len(results) - failed} of {len(results)} orders; see results for per-order errors"
+        print(json.dumps(result))
+        sys.exit(0 if result["success"] else 1)
+
     else:
         result = {
             "success": False,
             "error": "Invalid action",
-            "message": "Action must be 'scrape_address' or 'wait_for_code'"
+            "message": "Action must be 'scrape_address', 'wait_for_code' or 'wait_for_codes'"
         }
         print(json.dumps(result))
         sys.exit(1)